@@ -1,32 +1,40 @@
-import os
+import struct
 import time
 
-# I2C address of BMP280
-I2C_ADDR = "0x77"
-I2C_BUS = "1"
+import numpy as np
+from smbus2 import SMBus, i2c_msg
+
+try:
+    from numba import njit, prange
+except Exception:
+    # numba is optional: fall back to plain Python with the same call sites
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+    prange = range
 
+# I2C address of BMP280
+I2C_ADDR = 0x77
+I2C_BUS = 1
 
-def i2cget(register):
-    # Use sudo i2cget -y 1 0x77 register and read hex value
-    cmd = f"sudo i2cget -y {I2C_BUS} {I2C_ADDR} {register}"
-    result = os.popen(cmd).read().strip()
-    return int(result, 16)
+# Set by init()
+_bus = None
+dig_T1 = dig_T2 = dig_T3 = None
 
 
-def read_16bit_le(lsb_reg):
-    # Read 16-bit little endian value (LSB then MSB)
-    lsb = i2cget(lsb_reg)
-    msb = i2cget(hex(int(lsb_reg, 16) + 1))
-    print(
-        f"Reading {lsb_reg} | {hex(int(lsb_reg, 16) + 1)}: LSB={lsb:02X}, MSB={msb:02X}"
-    )
-    value = (msb << 8) | lsb
-    if value > 32767:  # signed conversion
-        value -= 65536
-    return value
+def burst(bus, reg, n):
+    # Register-pointer write + n-byte read as one repeated-START transaction
+    # (I2C_RDWR), instead of two separate transfers.
+    write = i2c_msg.write(I2C_ADDR, [reg])
+    read = i2c_msg.read(I2C_ADDR, n)
+    bus.i2c_rdwr(write, read)
+    return bytes(read)
 
 
 # From BMP280 datasheet, compensates raw temperature value
+@njit(cache=True, fastmath=False)
 def bmp280_compensate_T_int32(adc_T, dig_T1, dig_T2, dig_T3):
     var1 = ((((adc_T >> 3) - (dig_T1 << 1))) * dig_T2) >> 11
     var2 = (((((adc_T >> 4) - dig_T1) * ((adc_T >> 4) - dig_T1)) >> 12) * dig_T3) >> 14
@@ -35,7 +43,26 @@ def bmp280_compensate_T_int32(adc_T, dig_T1, dig_T2, dig_T3):
     return T
 
 
-def main():
+# Same formula over an int64 array of raw readings (offline reprocessing)
+@njit(cache=True, parallel=True)
+def bmp280_compensate_T_int32_batch(adc_T, dig_T1, dig_T2, dig_T3):
+    out = np.empty(adc_T.shape[0], dtype=np.int64)
+    for i in prange(adc_T.shape[0]):
+        out[i] = bmp280_compensate_T_int32(adc_T[i], dig_T1, dig_T2, dig_T3)
+    return out
+
+
+def init():
+    """Reset/configure the sensor and cache the calibration params.
+
+    dig_T1..dig_T3 are factory constants, so they are read once here and
+    sample() only has to fetch the measurement registers.
+    """
+    global _bus, dig_T1, dig_T2, dig_T3
+    # Open the bus once; every access below is a single ioctl on /dev/i2c-1
+    # instead of spawning a `sudo i2cget`/`i2cset` per register byte.
+    _bus = SMBus(I2C_BUS)
+
     # Initialize BMP280 (reset and set config)
     # Reset:
     # sudo i2cset -y 1 0x77 0xE0 0xB6
@@ -43,30 +70,34 @@ def main():
     # sudo i2cset -y 1 0x77 0xF5 0x90
     # Change Mode:
     # sudo i2cset -y 1 0x77 0xF4 0x43
-    os.popen(f"sudo i2cset -y {I2C_BUS} {I2C_ADDR} 0xE0 0xB6")
+    _bus.write_byte_data(I2C_ADDR, 0xE0, 0xB6)
     time.sleep(0.05)
-    os.popen(f"sudo i2cset -y {I2C_BUS} {I2C_ADDR} 0xF5 0x90")
+    _bus.write_byte_data(I2C_ADDR, 0xF5, 0x90)
     time.sleep(0.05)
-    os.popen(f"sudo i2cset -y {I2C_BUS} {I2C_ADDR} 0xF4 0x43")
+    _bus.write_byte_data(I2C_ADDR, 0xF4, 0x43)
     time.sleep(0.05)
 
-    # Read calibration params dig_T1, dig_T2, dig_T3
-    dig_T1 = read_16bit_le("0x88")
-    dig_T2 = read_16bit_le("0x8A")
-    dig_T3 = read_16bit_le("0x8C")
+    # Read calibration params dig_T1 (unsigned), dig_T2, dig_T3 (signed),
+    # little-endian 16-bit at 0x88..0x8D (datasheet section 3.11.2)
+    dig_T1, dig_T2, dig_T3 = struct.unpack("<Hhh", burst(_bus, 0x88, 6))
     print(f"dig_T1: {dig_T1}, dig_T2: {dig_T2}, dig_T3: {dig_T3}")
     time.sleep(0.05)
 
-    # Read raw temperature registers FA, FB, FC
-    A = i2cget("0xFA")
-    B = i2cget("0xFB")
-    C = i2cget("0xFC")
-    print(f"0xFA: {A:02X}, 0xFB: {B:02X}, 0xFC: {C:02X}")
 
-    adc_T = (A << 12) + (B << 4) + ((C & 0xF0) >> 4)
-    print(f"Raw Temperature: {adc_T}")
+def sample():
+    """Return the compensated temperature in hundredths of °C."""
+    # Read raw temperature registers FA, FB, FC in one burst
+    A, B, C = burst(_bus, 0xFA, 3)
+    adc_T = (A << 12) | (B << 4) | (C >> 4)
+    return bmp280_compensate_T_int32(adc_T, dig_T1, dig_T2, dig_T3)
 
-    temp = bmp280_compensate_T_int32(adc_T, dig_T1, dig_T2, dig_T3)
+
+def main():
+    init()
+    try:
+        temp = sample()
+    finally:
+        _bus.close()
 
     print(f"Temperature Float: {temp / 100:.2f} °C")
 
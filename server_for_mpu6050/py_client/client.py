@@ -2,17 +2,28 @@ import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 import numpy as np
 import math, time, threading
-import requests, json
-from collections import deque
+import asyncio, json
+import aiohttp
 
 try:
-    from sseclient import SSEClient
+    from orjson import loads as _loads
 except Exception:
-    SSEClient = None
+    _loads = json.loads
+
+try:
+    from numba import njit
+except Exception:
+    # numba is optional: fall back to plain Python with the same call sites
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
 
 # ---------- Config ----------
 UI_DT = 1.0 / 90.0  # draw interval
 SAMPLER_HZ = 10
+MAX_SAMPLE_GAP_S = 0.5  # don't integrate across longer gaps (stalls, reconnects)
 CORR_GAIN = 1.0  # accel tilt correction gain (0 = none, 0.5..3 typical)
 # Faster settling when stationary
 STATIONARY_CORR_MULT = 3.0  # extra gain when still
@@ -26,20 +37,23 @@ STATIONARY_GYRO_DPS_THRESH = 1.5  # dps threshold to consider "not rotating"
 ACCEL_NORM_TARGET = 1.0  # expected |accel| at rest (in g)
 ACCEL_NORM_TOL = 0.2  # +/- tolerance around target (g)
 
-# Integrator timing
-INTEGRATOR_HZ = 60  # Physics update rate (Hz)
-
 ORIENT_USE_AVG_GYRO = False
 ORIENT_USE_AVG_ACCEL = False
 
 # Temperature plot settings
 TEMP_WINDOW_S = 60  # seconds of temperature history to display
 MAX_TEMP_POINTS = 600  # cap number of stored points (avoid unbounded growth)
+HUD_DT = 0.1  # refresh period of the text HUD and temperature plot (s)
 
 # Data source: 'json' (polling) or 'sse' (server-sent events)
 DATA_SOURCE = "sse"  # change to 'sse' for streaming
 JSON_URL = "http://localhost:3737/json"  # returns a JSON object
+# Concurrent polls allowed when DATA_SOURCE == 'json'. Each one holds a server
+# connection slot (the C server closes /json replies, see max_connections in
+# server_config.cfg), so keep it below that limit or other clients get locked out.
+JSON_MAX_IN_FLIGHT = 1
 SSE_URL = "http://localhost:3737/events"  # Content-Type: text/event-stream
+SSE_MAX_FRAME_BYTES = 64 * 1024  # reconnect if an event grows past this
 
 # Axis remap/sign to match your board. Swap ('y','x','z') if X/Y are interchanged.
 ACCEL_AXIS_MAP = ("x", "y", "z")  # was ('x','y','z')
@@ -49,68 +63,194 @@ GYRO_AXIS_SIGN = (1, 1, 1)
 
 
 # ---------- Math helpers ----------
-def _remap_vec(d, amap, asign):
-    return np.array([d[amap[i]] * asign[i] for i in range(3)], dtype=float)
+# Element type of sensor vectors, orientation and geometry: the MPU6050 gives
+# 16-bit readings, so float32 is plenty.
+DTYPE = np.float32
 
+_AXIS_INDEX = {"x": 0, "y": 1, "z": 2}
 
-def _quat_mul(q, r):
-    w1, x1, y1, z1 = q
-    w2, x2, y2, z2 = r
-    return np.array(
-        [
-            w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
-            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
-            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
-            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
-        ],
-        dtype=float,
-    )
+
+def _axis_remap(axis_map, axis_sign):
+    """Compile an axis map/sign into ((i, sign), ...) pairs for _remap_vec.
+
+    Returns None for the identity mapping so _remap_vec can skip it.
+    """
+    if tuple(axis_map) == ("x", "y", "z") and tuple(axis_sign) == (1, 1, 1):
+        return None
+    return tuple((_AXIS_INDEX[c], float(sg)) for c, sg in zip(axis_map, axis_sign))
+
+
+_ACCEL_REMAP = _axis_remap(ACCEL_AXIS_MAP, ACCEL_AXIS_SIGN)
+_GYRO_REMAP = _axis_remap(GYRO_AXIS_MAP, GYRO_AXIS_SIGN)
 
 
-def _quat_norm(q):
-    n = np.linalg.norm(q)
-    return q / (n if n > 0 else 1.0)
+def _norm3(v):
+    # Plain-float |v|: np.linalg.norm on a 3-vector is mostly call overhead
+    x, y, z = v.tolist()
+    return math.sqrt(x * x + y * y + z * z)
 
 
-def _quat_to_R(q):
-    w, x, y, z = q
+def _remap_vec(raw, remap):
+    """Build the body-frame DTYPE vector from a raw (x, y, z) tuple."""
+    if remap is None:
+        return np.array(raw, dtype=DTYPE)
+    return np.array([raw[i] * sg for i, sg in remap], dtype=DTYPE)
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _quat_to_R(q, out):
+    """Write the rotation matrix (body->world) of unit quaternion q into out."""
+    w, x, y, z = q[0], q[1], q[2], q[3]
     ww, xx, yy, zz = w * w, x * x, y * y, z * z
-    return np.array(
-        [
-            [ww + xx - yy - zz, 2 * (x * y - w * z), 2 * (x * z + w * y)],
-            [2 * (x * y + w * z), ww - xx + yy - zz, 2 * (y * z - w * x)],
-            [2 * (x * z - w * y), 2 * (y * z + w * x), ww - xx - yy + zz],
-        ],
-        dtype=float,
+    xy, wz, xz, wy, yz, wx = x * y, w * z, x * z, w * y, y * z, w * x
+    out[0, 0] = ww + xx - yy - zz
+    out[0, 1] = 2 * (xy - wz)
+    out[0, 2] = 2 * (xz + wy)
+    out[1, 0] = 2 * (xy + wz)
+    out[1, 1] = ww - xx + yy - zz
+    out[1, 2] = 2 * (yz - wx)
+    out[2, 0] = 2 * (xz - wy)
+    out[2, 1] = 2 * (yz + wx)
+    out[2, 2] = ww - xx - yy + zz
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _integrate_kernel(q, R, a_b, g_dps, dt, gain):
+    """Advance q by one gyro step with accel tilt correction; refresh R in place.
+
+    g_dps is the bias-corrected body rate (deg/s) and a_b the body accel
+    whose direction the estimated gravity is pulled toward with `gain`.
+    """
+    # Tilt error e = v_b x an, where v_b = R^T [0, 0, 1] is the third row of R
+    n = math.sqrt(a_b[0] * a_b[0] + a_b[1] * a_b[1] + a_b[2] * a_b[2]) + 1e-9
+    ax, ay, az = a_b[0] / n, a_b[1] / n, a_b[2] / n
+    vx, vy, vz = R[2, 0], R[2, 1], R[2, 2]
+    wx = math.radians(g_dps[0]) + gain * (vy * az - vz * ay)
+    wy = math.radians(g_dps[1]) + gain * (vz * ax - vx * az)
+    wz = math.radians(g_dps[2]) + gain * (vx * ay - vy * ax)
+
+    w, x, y, z = q[0], q[1], q[2], q[3]
+    # q += 0.5 * q ⊗ (0, ω) * dt  (Hamilton product, pure-vector right operand)
+    h = 0.5 * dt
+    w, x, y, z = (
+        w - h * (x * wx + y * wy + z * wz),
+        x + h * (w * wx + y * wz - z * wy),
+        y + h * (w * wy - x * wz + z * wx),
+        z + h * (w * wz + x * wy - y * wx),
     )
+    n = math.sqrt(w * w + x * x + y * y + z * z)
+    inv = 1.0 / n if n > 0 else 1.0
+    w *= inv
+    x *= inv
+    y *= inv
+    z *= inv
+    q[0] = w
+    q[1] = x
+    q[2] = y
+    q[3] = z
+
+    # Refresh R from the normalized quaternion
+    _quat_to_R(q, R)
+
+
+def _rotate_vecs(q, V):
+    """Rotate the rows of V (N, 3) by unit quaternion q without building R."""
+    qv = q[1:]
+    t = 2.0 * np.cross(qv, V)
+    return V + q[0] * t + np.cross(qv, t)
 
 
 # ---------- Orientation state (quaternion body->world) ----------
-q = np.array([1.0, 0.0, 0.0, 0.0], dtype=float)
-R = np.eye(3)
+# Integrator state, stepped in place on the sampler thread only
+q = np.array([1.0, 0.0, 0.0, 0.0], dtype=DTYPE)
+R = np.eye(3, dtype=DTYPE)
 _running = True
 _lock = threading.Lock()
+_prev_now = None  # arrival time of the previous sample (integration dt)
+# Never below a few polling periods, or slow JSON polling would never integrate
+_MAX_GAP_S = max(MAX_SAMPLE_GAP_S, 3.0 / SAMPLER_HZ)
+_seq = 0  # bumped whenever displayed state changes; see update()
 
 # For HUD
-_last_accel = np.array([0.0, 0.0, 1.0])
-_last_gyro_dps = np.array([0.0, 0.0, 0.0])
+_last_accel = np.array([0.0, 0.0, 1.0], dtype=DTYPE)
+_last_gyro_dps = np.zeros(3, dtype=DTYPE)
 _last_temp_c = float("nan")
-_last_avg_accel = np.array([0.0, 0.0, 1.0])
-_last_avg_gyro_dps = np.array([0.0, 0.0, 0.0])
+_last_avg_accel = np.array([0.0, 0.0, 1.0], dtype=DTYPE)
+_last_avg_gyro_dps = np.zeros(3, dtype=DTYPE)
 _last_avg_temp_c = float("nan")
 # Track if average stream has arrived
 _have_avg = False
 
+# Published q for the UI, double-buffered without a lock (seqlock): the
+# writer fills the spare row and then bumps _q_gen, so row _q_gen & 1 always
+# holds the latest complete copy. R stays private to the integrator.
+_q_pub = np.zeros((2, 4), dtype=DTYPE)
+_q_pub[:] = q
+_q_gen = 0
+
+
+def _publish_q():
+    """Publish the current q (sampler thread only)."""
+    global _q_gen
+    _q_pub[(_q_gen + 1) & 1] = q
+    _q_gen += 1
+
+
+def _read_q():
+    """Return a copy of the last published q."""
+    while True:
+        gen = _q_gen
+        q_pub = _q_pub[gen & 1].copy()
+        # A new generation may have started rewriting our row: read again
+        if _q_gen == gen:
+            return q_pub
+
+
 # Gyro bias state (in dps)
-_g_bias_dps = np.zeros(3)
-_calib_sum = np.zeros(3)
+_g_bias_dps = np.zeros(3, dtype=DTYPE)
+_calib_sum = np.zeros(3, dtype=DTYPE)
 _calib_count = 0
 _calib_end_time = time.monotonic() + STARTUP_CALIBRATION_S
 
+
+class _TempRing:
+    """Fixed-size (timestamp, temp_c) history kept as two preallocated arrays.
+
+    Stored as float32: timestamps are seconds since _temp_t0, so they keep
+    ~10 ms resolution for about a day of uptime. Every point is written
+    twice, `size` slots apart, so the latest `count` points always form one
+    contiguous chronological slice and reading never has to unroll the ring.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.t_buf = np.empty(2 * size, dtype=np.float32)
+        self.v_buf = np.empty(2 * size, dtype=np.float32)
+        self.idx = 0  # next slot to write, in [0, size)
+        self.count = 0
+        self.version = 0  # bumped on every append
+
+    def append(self, t, v):
+        i, j = self.idx, self.idx + self.size
+        self.t_buf[i] = self.t_buf[j] = t
+        self.v_buf[i] = self.v_buf[j] = v
+        self.idx = (i + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        self.version += 1
+
+    def snapshot(self):
+        """Copy out (times, temps) in chronological order."""
+        end = self.idx + self.size
+        start = end - self.count
+        return self.t_buf[start:end].copy(), self.v_buf[start:end].copy()
+
+
+# Time origin for the temperature histories
+_temp_t0 = time.monotonic()
 # Temperature history (timestamp, temp_c)
-_temp_history = deque(maxlen=MAX_TEMP_POINTS)
+_temp_history = _TempRing(MAX_TEMP_POINTS)
 # Average temperature history (timestamp, temp_c)
-_temp_history_avg = deque(maxlen=MAX_TEMP_POINTS)
+_temp_history_avg = _TempRing(MAX_TEMP_POINTS)
 
 
 def _parse_payload(obj):
@@ -119,19 +259,20 @@ def _parse_payload(obj):
     Handles both payloads where sensor fields are at the top level and the
     wrapped structure with "sample" and "average". Returns:
       (a_sample, g_sample, temp_sample, a_avg, g_avg, temp_avg)
-    Average fields are None when not present.
+    with accel/gyro as raw (x, y, z) tuples. Average fields are None
+    when not present.
     """
     # tolerate either {ax,...} or { "sample": {...}, "average": {...} }
     sample = obj.get("sample", obj)
     avg = obj.get("average", None)
 
-    a_sample = {"x": sample["ax"], "y": sample["ay"], "z": sample["az"]}
-    g_sample = {"x": sample["gx"], "y": sample["gy"], "z": sample["gz"]}
+    a_sample = (sample["ax"], sample["ay"], sample["az"])
+    g_sample = (sample["gx"], sample["gy"], sample["gz"])
     temp_sample = sample.get("temp", None)
 
     if avg is not None:
-        a_avg = {"x": avg["ax"], "y": avg["ay"], "z": avg["az"]}
-        g_avg = {"x": avg["gx"], "y": avg["gy"], "z": avg["gz"]}
+        a_avg = (avg["ax"], avg["ay"], avg["az"])
+        g_avg = (avg["gx"], avg["gy"], avg["gz"])
         temp_avg = avg.get("temp", None)
     else:
         a_avg = g_avg = None
@@ -141,11 +282,13 @@ def _parse_payload(obj):
 
 
 def _ingest_sample(a_raw, g_raw, temp_c):
-    """Convert raw sensor payloads, update bias, and store the latest readings."""
+    """Convert raw sensor payloads, update bias, store the latest readings and
+    integrate orientation over the time since the previous sample."""
     global _last_accel, _last_gyro_dps, _last_temp_c, _g_bias_dps, _calib_sum, _calib_count
+    global _prev_now, _seq
 
-    a_b = _remap_vec(a_raw, ACCEL_AXIS_MAP, ACCEL_AXIS_SIGN)
-    g_meas_dps = _remap_vec(g_raw, GYRO_AXIS_MAP, GYRO_AXIS_SIGN)
+    a_b = _remap_vec(a_raw, _ACCEL_REMAP)
+    g_meas_dps = _remap_vec(g_raw, _GYRO_REMAP)
 
     now = time.monotonic()
     if now < _calib_end_time:
@@ -154,10 +297,10 @@ def _ingest_sample(a_raw, g_raw, temp_c):
         if _calib_count > 0:
             _g_bias_dps = _calib_sum / max(1, _calib_count)
     elif AUTO_BIAS:
-        accel_norm = np.linalg.norm(a_b)
+        # The accel norm is only needed if the gyro is still
         if (
-            np.linalg.norm(g_meas_dps - _g_bias_dps) < STATIONARY_GYRO_DPS_THRESH
-            and abs(accel_norm - ACCEL_NORM_TARGET) <= ACCEL_NORM_TOL
+            _norm3(g_meas_dps - _g_bias_dps) < STATIONARY_GYRO_DPS_THRESH
+            and abs(_norm3(a_b) - ACCEL_NORM_TARGET) <= ACCEL_NORM_TOL
         ):
             _g_bias_dps = (
                 1 - AUTO_BIAS_ALPHA
@@ -168,120 +311,206 @@ def _ingest_sample(a_raw, g_raw, temp_c):
     with _lock:
         _last_accel = a_b
         _last_gyro_dps = g_dps
+        _seq += 1
         if temp_c is not None:
             try:
                 _last_temp_c = float(temp_c)
             except (TypeError, ValueError):
                 pass
             else:
-                _temp_history.append((now, _last_temp_c))
+                _temp_history.append(now - _temp_t0, _last_temp_c)
+
+    # Integrate over the real time since the previous sample. After a stall
+    # or reconnect the latest rate says nothing about the gap, so skip it.
+    if _prev_now is not None and now - _prev_now <= _MAX_GAP_S:
+        _integrate(now - _prev_now)
+    _prev_now = now
 
 
 def _ingest_avg(a_raw, g_raw, temp_c):
     """Store latest averaged sensor readings (bias-correct gyro; no bias update)."""
     global _last_avg_accel, _last_avg_gyro_dps, _last_avg_temp_c, _have_avg
+    global _seq
     if a_raw is None or g_raw is None:
         return
-    a_b = _remap_vec(a_raw, ACCEL_AXIS_MAP, ACCEL_AXIS_SIGN)
+    a_b = _remap_vec(a_raw, _ACCEL_REMAP)
     # subtract current bias so integrator uses bias-corrected averaged gyro
-    g_dps = _remap_vec(g_raw, GYRO_AXIS_MAP, GYRO_AXIS_SIGN) - _g_bias_dps
+    g_dps = _remap_vec(g_raw, _GYRO_REMAP) - _g_bias_dps
     now = time.monotonic()
     with _lock:
         _last_avg_accel = a_b
         _last_avg_gyro_dps = g_dps
         _have_avg = True
+        _seq += 1
         if temp_c is not None:
             try:
                 _last_avg_temp_c = float(temp_c)
             except (TypeError, ValueError):
                 pass
             else:
-                _temp_history_avg.append((now, _last_avg_temp_c))
+                _temp_history_avg.append(now - _temp_t0, _last_avg_temp_c)
 
 
 def _integrate(dt):
     if dt <= 0:
         return
-    global q, R
-    with _lock:
-        # Keep raw gyro for responsiveness; averaged gyro only if enabled and available
-        g_dps = (
-            _last_avg_gyro_dps
-            if (ORIENT_USE_AVG_GYRO and _have_avg)
-            else _last_gyro_dps
-        )
+    # Runs on the sampler thread, the only writer of the _last_* readings and
+    # of q/R, so inputs are read unlocked and q is published lock-free.
+    # Keep raw gyro for responsiveness; averaged gyro only if enabled and available
+    g_dps = (
+        _last_avg_gyro_dps if (ORIENT_USE_AVG_GYRO and _have_avg) else _last_gyro_dps
+    )
 
-        # Detect stationarity (low gyro, accel near 1g)
-        accel_for_test = _last_accel
-        stationary = (
-            np.linalg.norm(g_dps) < STATIONARY_GYRO_DPS_THRESH
-            and abs(np.linalg.norm(accel_for_test) - ACCEL_NORM_TARGET)
-            <= ACCEL_NORM_TOL
-        )
+    # Detect stationarity (low gyro, accel near 1g)
+    accel_for_test = _last_accel
+    stationary = (
+        _norm3(g_dps) < STATIONARY_GYRO_DPS_THRESH
+        and abs(_norm3(accel_for_test) - ACCEL_NORM_TARGET) <= ACCEL_NORM_TOL
+    )
 
-        # Use raw accel when still (to avoid average-induced lag), else averaged accel if available
-        if USE_RAW_ACCEL_WHEN_STILL and stationary:
-            a_b = _last_accel
-        else:
-            a_b = (
-                _last_avg_accel if (ORIENT_USE_AVG_ACCEL and _have_avg) else _last_accel
-            )
+    # Use raw accel when still (to avoid average-induced lag), else averaged accel if available
+    if USE_RAW_ACCEL_WHEN_STILL and stationary:
+        a_b = _last_accel
+    else:
+        a_b = _last_avg_accel if (ORIENT_USE_AVG_ACCEL and _have_avg) else _last_accel
 
-        # Stronger correction when still
-        corr_gain = CORR_GAIN * (STATIONARY_CORR_MULT if stationary else 1.0)
+    # Stronger correction when still
+    corr_gain = CORR_GAIN * (STATIONARY_CORR_MULT if stationary else 1.0)
 
-        omega = np.radians(g_dps)
-        g_w = np.array([0.0, 0.0, 1.0])
-        an = a_b / (np.linalg.norm(a_b) + 1e-9)
-        v_b = R.T @ g_w
-        e = np.cross(v_b, an)
-        omega_corr = omega + corr_gain * e
-        q_dot = 0.5 * _quat_mul(q, np.array([0.0, *omega_corr]))
-        q[:] = _quat_norm(q + q_dot * dt)
-        R[:] = _quat_to_R(q)
+    global _seq
+    _integrate_kernel(q, R, a_b, g_dps, dt, corr_gain)
+    _publish_q()
+    _seq += 1
 
 
-def _sampler():
-    global _running
-    if DATA_SOURCE == "json":
-        period = 1.0 / SAMPLER_HZ
-        session = requests.Session()
-        while _running:
-            try:
-                resp = session.get(JSON_URL, timeout=1.0)
+async def _poll_json():
+    """Poll JSON_URL at SAMPLER_HZ on a single aiohttp session.
+
+    GETs are launched on a fixed cadence with up to JSON_MAX_IN_FLIGHT
+    outstanding, so one slow round-trip neither stalls the next poll nor
+    delays ingesting the previous response. Responses that land after a
+    newer one are dropped.
+    """
+    period = 1.0 / SAMPLER_HZ
+    timeout = aiohttp.ClientTimeout(total=1.0)
+    in_flight = set()
+    newest = -1
+    failed = False
+
+    async def fetch(session, seq):
+        nonlocal newest, failed
+        try:
+            async with session.get(JSON_URL) as resp:
                 resp.raise_for_status()
-                obj = resp.json()
-                # unpack sample + average
-                a_raw, g_raw, temp_c, a_avg, g_avg, temp_avg = _parse_payload(obj)
+                # parse the raw body; skips aiohttp's text decode + json.loads
+                obj = _loads(await resp.read())
+            # unpack sample + average
+            a_raw, g_raw, temp_c, a_avg, g_avg, temp_avg = _parse_payload(obj)
+            if seq > newest:  # drop responses that lost the race
+                newest = seq
                 _ingest_sample(a_raw, g_raw, temp_c)
                 if a_avg is not None and g_avg is not None:
                     _ingest_avg(a_avg, g_avg, temp_avg)
-            except Exception:
-                time.sleep(min(0.2, period))
-            # pace polling
-            time.sleep(period)
-    elif DATA_SOURCE == "sse":
-        if SSEClient is None:
-            raise RuntimeError(
-                "Install sseclient (or sseclient-py) for SSE: pip install sseclient"
-            )
+        except Exception:
+            failed = True
+            return
+        failed = False
+
+    # One pooled connection per allowed poll; aiohttp reuses them whenever the
+    # server keeps the connection alive (the C server closes /json replies).
+    connector = aiohttp.TCPConnector(limit=JSON_MAX_IN_FLIGHT)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        seq = 0
+        while _running:
+            if len(in_flight) < JSON_MAX_IN_FLIGHT:
+                task = asyncio.create_task(fetch(session, seq))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                seq += 1
+            # pace polling (back off a little while the server is failing)
+            await asyncio.sleep(period + (min(0.2, period) if failed else 0.0))
+        for task in list(in_flight):
+            task.cancel()
+
+
+def _sse_data(frame):
+    """Return the data field of one SSE frame (bytes, no trailing blank line).
+
+    Multi-line data fields are joined with newlines as per the spec; frames
+    without data (comments, `retry:`) give None.
+    """
+    if frame.startswith(b"data:") and b"\n" not in frame:
+        return frame[5:]  # the usual case: a single data line
+    data = [line[5:] for line in frame.split(b"\n") if line.startswith(b"data:")]
+    return b"\n".join(data) if data else None
+
+
+def _sse_lf(chunk, pending_cr):
+    """Normalize CRLF and CR line endings in a stream chunk to LF.
+
+    pending_cr says the previous chunk ended in CR, so a leading LF here is
+    the second half of that CRLF. Returns (chunk, pending_cr).
+    """
+    if pending_cr and chunk[:1] == b"\n":
+        chunk = chunk[1:]
+    if b"\r" not in chunk:
+        return chunk, False
+    return chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n"), chunk.endswith(b"\r")
+
+
+async def _stream_sse():
+    """Consume SSE_URL and ingest each event.
+
+    Whatever bytes the socket delivered are appended to one buffer and split
+    into frames on the blank line that ends each event, so there is no
+    per-line reading or str round-trip; the JSON is decoded from bytes.
+    CRLF and CR line endings are folded to LF as they arrive.
+    """
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=2.0)
+    headers = {"Accept": "text/event-stream"}
+    async with aiohttp.ClientSession(timeout=timeout) as session:
         while _running:
             try:
-                messages = SSEClient(SSE_URL)
-                for _, ev in enumerate(messages, start=1):
-                    if not _running:
-                        break
-                    if not ev.data:
-                        continue
-                    obj = json.loads(ev.data)
-                    a_raw, g_raw, temp_c, a_avg, g_avg, temp_avg = _parse_payload(obj)
-                    _ingest_sample(a_raw, g_raw, temp_c)
-                    if a_avg is not None and g_avg is not None:
-                        _ingest_avg(a_avg, g_avg, temp_avg)
+                async with session.get(SSE_URL, headers=headers) as resp:
+                    resp.raise_for_status()
+                    buf = bytearray()
+                    pending_cr = False
+                    async for chunk in resp.content.iter_any():
+                        if not _running:
+                            break
+                        chunk, pending_cr = _sse_lf(chunk, pending_cr)
+                        buf += chunk
+                        start = 0
+                        while (end := buf.find(b"\n\n", start)) >= 0:
+                            data = _sse_data(buf[start:end])
+                            start = end + 2
+                            if data is None:
+                                continue
+                            obj = _loads(data)
+                            a_raw, g_raw, temp_c, a_avg, g_avg, temp_avg = (
+                                _parse_payload(obj)
+                            )
+                            _ingest_sample(a_raw, g_raw, temp_c)
+                            if a_avg is not None and g_avg is not None:
+                                _ingest_avg(a_avg, g_avg, temp_avg)
+                        del buf[:start]
+                        if len(buf) > SSE_MAX_FRAME_BYTES:
+                            raise ValueError(
+                                f"SSE event larger than {SSE_MAX_FRAME_BYTES} bytes"
+                            )
             except Exception as e:
                 # Surface the error so it's not silent, then reconnect after short delay
                 print(f"[SSE] reconnecting after error: {e!r}")
-                time.sleep(0.5)
+            if _running:
+                await asyncio.sleep(0.5)
+
+
+def _sampler():
+    global _running
+    if DATA_SOURCE == "json":
+        asyncio.run(_poll_json())
+    elif DATA_SOURCE == "sse":
+        asyncio.run(_stream_sse())
     else:
         raise ValueError(f"Unknown DATA_SOURCE: {DATA_SOURCE}")
 
@@ -289,15 +518,6 @@ def _sampler():
 threading.Thread(target=_sampler, daemon=True).start()
 
 
-def _integrator_thread():
-    period = 1.0 / INTEGRATOR_HZ
-    while _running:
-        _integrate(period)
-        time.sleep(period)
-
-
-threading.Thread(target=_integrator_thread, daemon=True).start()
-
 # ---------- Plot setup ----------
 cube = (
     np.array(
@@ -310,31 +530,36 @@ cube = (
             [1, -1, 1],
             [1, 1, 1],
             [-1, 1, 1],
-        ]
+        ],
+        dtype=DTYPE,
     )
     * 0.5
 )
 
-edges = [
-    [0, 1],
-    [1, 2],
-    [2, 3],
-    [3, 0],
-    [4, 5],
-    [5, 6],
-    [6, 7],
-    [7, 4],
-    [0, 4],
-    [1, 5],
-    [2, 6],
-    [3, 7],
-]
+edges = np.array(
+    [
+        [0, 1],
+        [1, 2],
+        [2, 3],
+        [3, 0],
+        [4, 5],
+        [5, 6],
+        [6, 7],
+        [7, 4],
+        [0, 4],
+        [1, 5],
+        [2, 6],
+        [3, 7],
+    ],
+    dtype=np.intp,
+)
 
-fig = plt.figure(constrained_layout=True, figsize=(13, 6))
+fig = plt.figure(constrained_layout=True, figsize=(14, 7))
 fig.suptitle("MPU6050 Live Telemetry", fontsize=14, fontweight="bold")
-gs = fig.add_gridspec(2, 2, width_ratios=(2.4, 1), height_ratios=(3, 1))
+# The HUD gets its own full-height column: its 25 lines need the room
+gs = fig.add_gridspec(1, 3, width_ratios=(2.4, 1.3, 1))
 
-ax_orient = fig.add_subplot(gs[:, 0], projection="3d")
+ax_orient = fig.add_subplot(gs[0, 0], projection="3d")
 ax_orient.set_xlim(-1, 1)
 ax_orient.set_ylim(-1, 1)
 ax_orient.set_zlim(-1, 1)
@@ -352,7 +577,7 @@ ax_temp.set_title("Temperature Trend", pad=12)
 ax_temp.grid(True, alpha=0.3)
 ax_temp.margins(x=0)
 
-ax_info = fig.add_subplot(gs[1, 1])
+ax_info = fig.add_subplot(gs[0, 2])
 ax_info.axis("off")
 ax_info.set_title("Latest Sample", loc="left", pad=12)
 
@@ -362,147 +587,224 @@ axis_lines = [
     ax_orient.plot([], [], [], "g-", linewidth=3)[0],  # Y
     ax_orient.plot([], [], [], "b-", linewidth=3)[0],  # Z
 ]
+# Tips of the body X/Y/Z axes, drawn from the origin
 axis_vectors = np.array(
     [
-        [[0, 0, 0], [0.7, 0, 0]],
-        [[0, 0, 0], [0, 0.7, 0]],
-        [[0, 0, 0], [0, 0, 0.7]],
-    ]
+        [0.7, 0, 0],
+        [0, 0.7, 0],
+        [0, 0, 0.7],
+    ],
+    dtype=DTYPE,
 )
+# Cube vertices, origin and axis tips, rotated together in one call per frame.
+# segments holds the two point indices of each line in lines + axis_lines.
+all_points = np.vstack([cube, np.zeros((1, 3), dtype=DTYPE), axis_vectors])
+segments = np.vstack([edges, [[8, 9], [8, 10], [8, 11]]])
 
 (temp_line,) = ax_temp.plot([], [], color="orange", linewidth=1.5, label="sample")
 (temp_line_avg,) = ax_temp.plot([], [], color="tab:blue", linewidth=1.5, label="avg")
 temp_label = ax_temp.text(0.02, 0.95, "", transform=ax_temp.transAxes, fontsize=10)
 ax_temp.set_xlim(0, TEMP_WINDOW_S)
-ax_temp.legend(loc="upper right", fontsize=9)
+ax_temp.legend(loc="lower right", fontsize=9)
 info_text = ax_info.text(
     0.0,
-    0.95,
+    1.0,
     "",
     transform=ax_info.transAxes,
-    fontsize=11,
+    fontsize=10,
     family="monospace",
     va="top",
     ha="left",
+    clip_on=True,  # blitting only restores the Axes area, keep the HUD inside it
+)
+# HUD text, filled with one %-format call per refresh
+_HUD_TMPL = (
+    "Orientation\n"
+    "  Pitch : %6.2f°\n"
+    "  Roll  : %6.2f°\n"
+    "  Yaw   : %6.2f°\n"
+    "\n"
+    "Acceleration (g, avg)\n"
+    "  ax: %6.3f\n"
+    "  ay: %6.3f\n"
+    "  az: %6.3f\n"
+    "\n"
+    "Gyro (°/s, avg)\n"
+    "  gx: %6.2f\n"
+    "  gy: %6.2f\n"
+    "  gz: %6.2f\n"
+    "\n"
+    "Acceleration (g)\n"
+    "  ax: %6.3f\n"
+    "  ay: %6.3f\n"
+    "  az: %6.3f\n"
+    "\n"
+    "Gyro (°/s)\n"
+    "  gx: %6.2f\n"
+    "  gy: %6.2f\n"
+    "  gz: %6.2f\n"
+    "\n"
+    "Temperature\n  sample=%s  avg=%s"
 )
+# avg accel, avg gyro, accel, gyro: copied here under the lock for the HUD
+_hud_snap = np.empty(12, dtype=DTYPE)
+orient_artists = lines + axis_lines
+temp_artists = [temp_line, temp_line_avg, temp_label]
+artists = orient_artists + [info_text] + temp_artists
+
+# What the artists currently show; update() only touches what moved
+_last_drawn_seq = -1
+_last_hud_seq = -1
+# Ring versions behind the cached snapshots below
+_drawn_temp_versions = [-1, -1]
+_empty = np.empty(0, dtype=np.float32)
+_temp_snaps = [(_empty, _empty), (_empty, _empty)]  # (times, temps) per ring
+_last_hud_time = 0.0
+_q_drawn = None
+_redraw_all = False  # set after a full canvas draw wiped the blitted artists
 
 
 def update(_):
-    # Snapshot orientation and raw data
-    with _lock:
-        R_now = R.copy()
-        # use for display
-        a_avg_now = _last_avg_accel.copy()
-        g_avg_now = _last_avg_gyro_dps.copy()
-        a_now = _last_accel.copy()
-        g_now = _last_gyro_dps.copy()
-        temp_points = list(_temp_history)
-        temp_points_avg = list(_temp_history_avg)
-        temp_now = _last_temp_c
-        temp_avg_now = _last_avg_temp_c
-    # Rotate geometry (body -> world)
-    rotated_cube = cube @ R_now.T
-    for i, e in enumerate(edges):
-        xs, ys, zs = zip(rotated_cube[e[0]], rotated_cube[e[1]])
-        lines[i].set_data(xs, ys)
-        lines[i].set_3d_properties(zs)
-
-    for i in range(3):
-        rotated_axis = axis_vectors[i] @ R_now.T
-        xs, ys, zs = rotated_axis[:, 0], rotated_axis[:, 1], rotated_axis[:, 2]
-        axis_lines[i].set_data(xs, ys)
-        axis_lines[i].set_3d_properties(zs)
-
-    # HUD: quick Euler from R (for display only)
-    pitch = math.degrees(math.atan2(-R_now[2, 1], R_now[2, 2]))
-    roll = math.degrees(
-        math.atan2(R_now[2, 0], math.sqrt(R_now[2, 1] ** 2 + R_now[2, 2] ** 2))
+    """Refresh the artists whose data changed and return only those.
+
+    With blitting, artists left out keep what is already on screen; an idle
+    frame returns an empty list, which _PartialBlitAnimation turns into a
+    no-op. The cube follows every frame; the text HUD and temperature plot
+    are only refreshed every HUD_DT.
+    """
+    global _last_drawn_seq, _last_hud_seq, _last_hud_time
+    global _q_drawn, _redraw_all
+    t = time.monotonic()
+    hud_due = t - _last_hud_time >= HUD_DT
+    hud_dirty = hud_due and _seq != _last_hud_seq
+    temp_dirty = hud_due and (
+        _temp_history.version != _drawn_temp_versions[0]
+        or _temp_history_avg.version != _drawn_temp_versions[1]
     )
-    yaw = math.degrees(math.atan2(R_now[1, 0], R_now[0, 0]))
-
-    temp_text = "n/a" if math.isnan(temp_now) else f"{temp_now:5.2f}°C"
-    temp_avg_text = "n/a" if math.isnan(temp_avg_now) else f"{temp_avg_now:5.2f}°C"
-
-    # Update temperature plot (common window, both series)
-    series = []
-    if temp_points:
-        latest_sample_t = temp_points[-1][0]
-        series.append(latest_sample_t)
-    if temp_points_avg:
-        latest_avg_t = temp_points_avg[-1][0]
-        series.append(latest_avg_t)
-    if series:
-        latest_time = max(series)
-        window_start = latest_time - TEMP_WINDOW_S
-
-        # sample
-        filtered = [(t, v) for t, v in temp_points if t >= window_start]
-        if filtered:
-            xs_s = [t - window_start for t, _ in filtered]
-            ys_s = [v for _, v in filtered]
-            temp_line.set_data(xs_s, ys_s)
+    if _seq == _last_drawn_seq and not (hud_dirty or temp_dirty):
+        if _redraw_all:
+            _redraw_all = False
+            return artists
+        return []
+    # Snapshot orientation (lock-free) and, when due, the raw data
+    _last_drawn_seq = _seq
+    q_now = _read_q().tolist()
+    if hud_dirty or temp_dirty:
+        _last_hud_time = t
+        with _lock:
+            if hud_dirty:
+                _last_hud_seq = _last_drawn_seq
+                # use for display, in _HUD_TMPL order
+                _hud_snap[0:3] = _last_avg_accel
+                _hud_snap[3:6] = _last_avg_gyro_dps
+                _hud_snap[6:9] = _last_accel
+                _hud_snap[9:12] = _last_gyro_dps
+            if temp_dirty:
+                # Only copy out the history that actually grew
+                for k, ring in enumerate((_temp_history, _temp_history_avg)):
+                    if ring.version != _drawn_temp_versions[k]:
+                        _drawn_temp_versions[k] = ring.version
+                        _temp_snaps[k] = ring.snapshot()
+            temp_now = _last_temp_c
+            temp_avg_now = _last_avg_temp_c
+    changed = []
+
+    if q_now != _q_drawn:
+        _q_drawn = q_now
+        # Rotate geometry (body -> world)
+        points = _rotate_vecs(q_now, all_points)
+        # (15, 3, 2): per line, the x/y/z coordinates of both ends
+        segs = points[segments].transpose(0, 2, 1)
+        for line, seg in zip(orient_artists, segs):
+            line.set_data_3d(*seg)
+        changed += orient_artists
+
+    if hud_dirty or temp_dirty:
+        temp_text = "n/a" if math.isnan(temp_now) else f"{temp_now:5.2f}°C"
+        temp_avg_text = "n/a" if math.isnan(temp_avg_now) else f"{temp_avg_now:5.2f}°C"
+
+    relimited = False
+    if temp_dirty:
+        # Update temperature plot (common window, both series)
+        (t_s, v_s), (t_a, v_a) = _temp_snaps
+        series = []
+        if t_s.size:
+            series.append(t_s[-1])
+        if t_a.size:
+            series.append(t_a[-1])
+        if series:
+            latest_time = max(series)
+            window_start = latest_time - TEMP_WINDOW_S
+
+            # Both series are chronological, so the window is a tail slice
+            i_s = np.searchsorted(t_s, window_start)
+            i_a = np.searchsorted(t_a, window_start)
+            ys_s = v_s[i_s:]
+            ys_a = v_a[i_a:]
+            temp_line.set_data(t_s[i_s:] - window_start, ys_s)
+            temp_line_avg.set_data(t_a[i_a:] - window_start, ys_a)
+
+            # y-range across both series
+            if ys_s.size or ys_a.size:
+                y_min = min(ys.min() for ys in (ys_s, ys_a) if ys.size)
+                y_max = max(ys.max() for ys in (ys_s, ys_a) if ys.size)
+                if y_min == y_max:
+                    y_min -= 0.5
+                    y_max += 0.5
+                margin = max(0.5, 0.1 * (y_max - y_min))
+                lo, hi = ax_temp.get_ylim()
+                # Ticks/grid live in the blitted background, so a limit change
+                # costs a full redraw: only re-tune when the data leaves the
+                # current range or has shrunk to well under half of it.
+                if (
+                    y_min < lo
+                    or y_max > hi
+                    or 2 * (y_max - y_min + 2 * margin) < hi - lo
+                ):
+                    ax_temp.set_ylim(y_min - margin, y_max + margin)
+                    # Not draw(): we may be inside a draw already (first frame),
+                    # where GUI canvases ignore it. The queued draw refreshes
+                    # the backgrounds and _on_draw hands every artist back, so
+                    # don't blit the temperature Axes over stale ticks now.
+                    fig.canvas.draw_idle()
+                    relimited = True
         else:
             temp_line.set_data([], [])
-
-        # average
-        filtered_avg = [(t, v) for t, v in temp_points_avg if t >= window_start]
-        if filtered_avg:
-            xs_a = [t - window_start for t, _ in filtered_avg]
-            ys_a = [v for _, v in filtered_avg]
-            temp_line_avg.set_data(xs_a, ys_a)
-        else:
             temp_line_avg.set_data([], [])
 
-        ax_temp.set_xlim(0, TEMP_WINDOW_S)
-        # y-range across both series
-        ys_all = []
-        if filtered:
-            ys_all += ys_s
-        if filtered_avg:
-            ys_all += ys_a
-        if ys_all:
-            y_min, y_max = min(ys_all), max(ys_all)
-            if y_min == y_max:
-                y_min -= 0.5
-                y_max += 0.5
-            margin = max(0.5, 0.1 * (y_max - y_min))
-            ax_temp.set_ylim(y_min - margin, y_max + margin)
-    else:
-        temp_line.set_data([], [])
-        temp_line_avg.set_data([], [])
-
-    temp_label.set_text(f"Latest: sample={temp_text}  avg={temp_avg_text}")
-
-    # Print averaged accel/gyro in HUD
-    info_text.set_text(
-        "Orientation\n"
-        f"  Pitch : {pitch:6.2f}°\n"
-        f"  Roll  : {roll:6.2f}°\n"
-        f"  Yaw   : {yaw:6.2f}°\n"
-        "\n"
-        "Acceleration (g, avg)\n"
-        f"  ax: {a_avg_now[0]:6.3f}\n"
-        f"  ay: {a_avg_now[1]:6.3f}\n"
-        f"  az: {a_avg_now[2]:6.3f}\n"
-        "\n"
-        "Gyro (°/s, avg)\n"
-        f"  gx: {g_avg_now[0]:6.2f}\n"
-        f"  gy: {g_avg_now[1]:6.2f}\n"
-        f"  gz: {g_avg_now[2]:6.2f}\n"
-        "\n"
-        "Acceleration (g)\n"
-        f"  ax: {a_now[0]:6.3f}\n"
-        f"  ay: {a_now[1]:6.3f}\n"
-        f"  az: {a_now[2]:6.3f}\n"
-        "\n"
-        "Gyro (°/s)\n"
-        f"  gx: {g_now[0]:6.2f}\n"
-        f"  gy: {g_now[1]:6.2f}\n"
-        f"  gz: {g_now[2]:6.2f}\n"
-        "\n"
-        f"Temperature\n  sample={temp_text}  avg={temp_avg_text}"
-    )
-    return lines + axis_lines + [info_text, temp_line, temp_line_avg, temp_label]
+        temp_label.set_text(f"Latest: sample={temp_text}  avg={temp_avg_text}")
+        if not relimited:
+            changed += temp_artists
+
+    if hud_dirty:
+        # HUD: Euler angles straight from the quaternion (display only)
+        qw, qx, qy, qz = q_now
+        pitch = math.degrees(
+            math.atan2(-2 * (qw * qx + qy * qz), 1 - 2 * (qx * qx + qy * qy))
+        )
+        roll = math.degrees(-math.asin(max(-1.0, min(1.0, 2 * (qw * qy - qz * qx)))))
+        yaw = math.degrees(
+            math.atan2(2 * (qw * qz + qx * qy), 1 - 2 * (qy * qy + qz * qz))
+        )
+
+        # Print averaged accel/gyro in HUD
+        info_text.set_text(
+            _HUD_TMPL
+            % (
+                pitch,
+                roll,
+                yaw,
+                *_hud_snap.tolist(),
+                temp_text,
+                temp_avg_text,
+            )
+        )
+        changed.append(info_text)
+
+    if _redraw_all:
+        _redraw_all = False
+        return artists
+    return changed
 
 
 def _on_close(_):
@@ -510,11 +812,55 @@ def _on_close(_):
     _running = False
 
 
+def _on_draw(_):
+    # A full draw leaves the (animated) artists off the canvas and may have
+    # changed ticks or (constrained) layout: drop the cached backgrounds so
+    # they are grabbed again, and resend every artist.
+    global _redraw_all
+    _redraw_all = True
+    ani._blit_cache.clear()
+
+
 fig.canvas.mpl_connect("close_event", _on_close)
 
-ani = FuncAnimation(
-    fig, update, interval=int(UI_DT * 1000), blit=False, cache_frame_data=False
+
+class _PartialBlitAnimation(FuncAnimation):
+    """FuncAnimation that only touches the Axes it is about to redraw.
+
+    The stock version restores the background of every Axes drawn in the
+    previous frame before calling update(), so an Axes left out of the next
+    frame would be wiped from the canvas buffer. update() always returns
+    either all or none of an Axes' artists, so clearing just the Axes in
+    its return value is enough. An empty frame would make the stock version
+    fall back to a full draw_idle(), which drops every animated artist;
+    here it simply leaves the canvas as it is.
+
+    Overrides private Animation hooks (_pre_draw, _draw_frame, _post_draw);
+    checked against matplotlib 3.10-3.11, the range pinned in requirements.txt;
+    recheck them before widening it.
+    """
+
+    def _pre_draw(self, framedata, blit):
+        pass
+
+    def _post_draw(self, framedata, blit):
+        if blit and not self._drawn_artists:
+            return
+        super()._post_draw(framedata, blit)
+
+    def _draw_frame(self, framedata):
+        super()._draw_frame(framedata)
+        if self._blit:
+            self._blit_clear(self._drawn_artists)
+
+
+# Only the artists returned by update() are redrawn each frame; axes,
+# labels, legend and grid come from the cached background.
+ani = _PartialBlitAnimation(
+    fig, update, interval=int(UI_DT * 1000), blit=True, cache_frame_data=False
 )
+# Connected once ani exists: building it already draws (the init frame)
+fig.canvas.mpl_connect("draw_event", _on_draw)
 plt.show()
 
 # Keep reference alive